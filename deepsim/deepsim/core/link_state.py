@@ -155,10 +155,12 @@ class LinkState:
         Returns:
             LinkState: new LinkState object created from ROS LinkState
         """
-        return LinkState(link_name=value.link_name,
-                         pose=Pose.from_ros(value.pose),
-                         twist=Twist.from_ros(value.twist),
-                         reference_frame=value.reference_frame)
+        link_state = LinkState.__new__(LinkState)
+        link_state._link_name = value.link_name
+        link_state._pose = Pose.from_ros(value.pose)
+        link_state._twist = Twist.from_ros(value.twist)
+        link_state._reference_frame = value.reference_frame or ''
+        return link_state
 
     def copy(self) -> 'LinkState':
         """
@@ -167,10 +169,14 @@ class LinkState:
         Returns:
             LinkState: the copied link state
         """
-        return LinkState(link_name=self.link_name,
-                         pose=self._pose,
-                         twist=self._twist,
-                         reference_frame=self.reference_frame)
+        # The pose and twist are never handed out or modified in place (properties return copies and
+        # setters store copies), so the copy can share them instead of cloning.
+        link_state = LinkState.__new__(LinkState)
+        link_state._link_name = self._link_name
+        link_state._pose = self._pose
+        link_state._twist = self._twist
+        link_state._reference_frame = self._reference_frame
+        return link_state
 
     def __eq__(self, other: 'LinkState') -> bool:
         """
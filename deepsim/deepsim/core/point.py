@@ -238,9 +238,9 @@ class Point:
         Returns:
             ROSPoint: new ROSPoint object created from ROS Point
         """
-        return Point(x=value.x,
-                     y=value.y,
-                     z=value.z)
+        point = Point.__new__(Point)
+        point._buffer = np.array((value.x, value.y, value.z), dtype=float)
+        return point
 
     @staticmethod
     def from_list(value: Union[list, tuple]) -> 'Point':
@@ -104,8 +104,10 @@ class Pose:
         Returns:
             Pose: new Pose object created from ROS Pose
         """
-        return Pose(position=Point.from_ros(value.position),
-                    orientation=Quaternion.from_ros(value.orientation))
+        pose = Pose.__new__(Pose)
+        pose._position = Point.from_ros(value.position)
+        pose._orientation = Quaternion.from_ros(value.orientation)
+        return pose
 
     def copy(self) -> 'Pose':
         """
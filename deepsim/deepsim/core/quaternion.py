@@ -381,10 +381,9 @@ class Quaternion:
         Returns:
             Quaternion: new Quaternion object created from ROS Quaternion
         """
-        return Quaternion(x=value.x,
-                          y=value.y,
-                          z=value.z,
-                          w=value.w)
+        quaternion = Quaternion.__new__(Quaternion)
+        quaternion._buffer = np.array((value.x, value.y, value.z, value.w), dtype=float)
+        return quaternion
 
     @staticmethod
     def from_list(value: Union[list, tuple]) -> 'Quaternion':
@@ -102,8 +102,10 @@ class Twist:
         Returns:
             Twist: new Twist object created from ROS Twist
         """
-        return Twist(linear=Vector3.from_ros(value.linear),
-                     angular=Vector3.from_ros(value.angular))
+        twist = Twist.__new__(Twist)
+        twist._linear = Vector3.from_ros(value.linear)
+        twist._angular = Vector3.from_ros(value.angular)
+        return twist
 
     def copy(self) -> 'Twist':
         """
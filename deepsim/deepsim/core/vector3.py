@@ -451,9 +451,9 @@ class Vector3:
         Returns:
             Vector3: new Vector3 object created from ROS Vector3
         """
-        return Vector3(x=value.x,
-                       y=value.y,
-                       z=value.z)
+        vector = Vector3.__new__(Vector3)
+        vector._buffer = np.array((value.x, value.y, value.z), dtype=float)
+        return vector
 
     @staticmethod
     def from_list(value: Union[list, tuple]) -> 'Vector3':
@@ -14,6 +14,8 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for ROS service proxy wrapper."""
+import socket
+import threading
 from typing import Any
 import rospy
 
@@ -28,7 +30,8 @@ class ServiceProxyWrapper(object):
        calls when the cancel simulation API is called.
     """
     def __init__(self, name: str, service_class: object, persistent: bool = False, headers: dict = None,
-                 should_wait_for_service: bool = True, max_retry_attempts: int = 5) -> None:
+                 should_wait_for_service: bool = True, max_retry_attempts: int = 5,
+                 tcp_nodelay: bool = False) -> None:
         """
         Initialize ServiceProxyWrapper
 
@@ -39,13 +42,25 @@ class ServiceProxyWrapper(object):
             headers (dict): (optional) arbitrary headers
             should_wait_for_service (bool): The flag whether wrapper should wait for service or not.
             max_retry_attempts (int): maximum number of retry
+            tcp_nodelay (bool): flag to disable Nagle's algorithm on the service connection or not.
+                                Only the client side socket of the persistent connection is set with TCP_NODELAY.
+                                The tcp_nodelay connection header is also sent, but whether the service sets
+                                its side depends on the service's ROS client library.
         """
         if should_wait_for_service:
             rospy.wait_for_service(name)
+        if tcp_nodelay:
+            headers = dict(headers) if headers else {}
+            headers['tcp_nodelay'] = '1'
         self._client = rospy.ServiceProxy(name=name,
                                           service_class=service_class,
                                           persistent=persistent,
                                           headers=headers)
+        self._persistent = persistent
+        # A persistent connection is shared by all calls, so calls are serialized not to interleave on it.
+        self._persistent_lock = threading.Lock() if persistent else None
+        self._tcp_nodelay = tcp_nodelay
+        self._nodelay_transport = None
         self._max_retry_attempts = max_retry_attempts
 
     @property
@@ -82,6 +97,8 @@ class ServiceProxyWrapper(object):
         try_count = 0
         while True:
             try:
+                if self._persistent:
+                    return self._call_persistent(*args, **kwarg)
                 return self._client(*args, **kwarg)
             except TypeError as err:
                 rospy.logerr("[ServiceProxyWrapper] Invalid arguments for client: {}".format(err))
@@ -95,3 +112,47 @@ class ServiceProxyWrapper(object):
                                                                     str(self._max_retry_attempts),
                                                                     ex)
                 rospy.logerr(error_message)
+
+    def _call_persistent(self, *args: Any, **kwarg: Any) -> Any:
+        """
+        Makes a client call through the persistent connection
+
+        Args:
+            args (Any): Arbitrary arguments to pass into the client call
+            kwarg (Any): Arbitrary keyword arguments to pass into the client call.
+
+        Returns:
+            Any: the return value(s) from service call.
+        """
+        with self._persistent_lock:
+            try:
+                res = self._client(*args, **kwarg)
+            except TypeError:
+                raise
+            except Exception:
+                # Drop the broken persistent connection, so next attempt reconnects.
+                self._client.close()
+                self._client.transport = None
+                self._nodelay_transport = None
+                raise
+            if self._tcp_nodelay:
+                self._set_tcp_nodelay()
+            return res
+
+    def _set_tcp_nodelay(self) -> None:
+        """
+        Set TCP_NODELAY to the socket of the persistent connection if it is not set yet.
+        - rospy.ServiceProxy connects inside the service call and exposes no hook to run once connected,
+          so this is called right after the call that made the connection returns. The first request
+          on each new or reconnected connection is sent before TCP_NODELAY is set.
+        """
+        transport = self._client.transport
+        if transport is not None and transport is not self._nodelay_transport:
+            sock = getattr(transport, 'socket', None)
+            if sock is not None:
+                # TCP_NODELAY is best-effort, failing to set it must not fail the call that already succeeded.
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError as ex:
+                    rospy.logerr("[ServiceProxyWrapper] Unable to set TCP_NODELAY: {}".format(ex))
+                self._nodelay_transport = transport
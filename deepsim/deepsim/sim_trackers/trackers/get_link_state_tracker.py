@@ -14,28 +14,128 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for get_link_state tracker."""
-from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+import sys
 import threading
 from typing import Optional, Collection, Dict, Tuple
 
+import numpy as np
+
 from deepsim.exception import DeepSimException
 from deepsim.gazebo.constants import GazeboServiceName
 from deepsim.sim_trackers.tracker import TrackerInterface
 from deepsim.sim_trackers.tracker_manager import TrackerManager
-from deepsim.core.twist import Twist
-from deepsim.core.pose import Pose
 from deepsim.core.link_state import LinkState
 from deepsim.ros.service_proxy_wrapper import ServiceProxyWrapper
 import deepsim.sim_trackers.constants as consts
 
 from deepsim_msgs.srv import (
     GetLinkStates,
+    GetLinkStatesResponse,
     GetAllLinkStates,
     GetAllLinkStatesRequest
 )
+from gazebo_msgs.msg import LinkState as ROSLinkState
 from rosgraph_msgs.msg import Clock
 
 
+# The maximum number of threads serving get_link_state_async.
+ASYNC_MAX_WORKERS = 4
+# The maximum number of links set_link_state adds to the link map on top of the tracked links,
+# the least recently set of those links are evicted beyond this.
+MAX_LINK_MAP_SIZE = 4096
+
+# Column layout of the link state rows used by the bulk numpy accessors.
+_POSITION_COLUMNS = slice(0, 3)
+_ORIENTATION_COLUMNS = slice(3, 7)
+_LINEAR_COLUMNS = slice(7, 10)
+_ANGULAR_COLUMNS = slice(10, 13)
+_ROW_SIZE = 13
+# Reference frames that default to world frame.
+_WORLD_REFERENCE_FRAMES = ('', 'world', 'map')
+
+
+class _PendingBatch(object):
+    """
+    Link state queries to be retrieved together in a single GetLinkStates service call
+    """
+    def __init__(self) -> None:
+        """
+        Initialize _PendingBatch
+        """
+        self.names = []
+        self.reference_frames = []
+        # Set when the batch is allowed to be sent, i.e., no other batch is in flight.
+        self.send_event = threading.Event()
+        self.done_event = threading.Event()
+        self.res = None
+        self.error = None
+
+
+class _LazyLinkState(object):
+    """
+    Cache entry that defers the conversion from ROS LinkState until the link state is first read
+    """
+    def __init__(self, ros_link_state: Optional[ROSLinkState] = None,
+                 link_state: Optional[LinkState] = None) -> None:
+        """
+        Initialize _LazyLinkState
+
+        Args:
+            ros_link_state (Optional[ROSLinkState]): ROS LinkState to convert on first read
+            link_state (Optional[LinkState]): already converted link state
+        """
+        self._ros_link_state = ros_link_state
+        self._link_state = link_state
+
+    @property
+    def ros_link_state(self) -> ROSLinkState:
+        """
+        Returns the ROS LinkState, converting it from the link state if it was not given.
+        - The returned ROS LinkState is shared by all readers of this entry and must not be modified.
+
+        Returns:
+            ROSLinkState: the ROS LinkState
+        """
+        if self._ros_link_state is None:
+            self._ros_link_state = self._link_state.to_ros()
+        return self._ros_link_state
+
+    @property
+    def link_state(self) -> LinkState:
+        """
+        Returns the link state, converting it from ROS LinkState on first access.
+        - The returned link state is shared by all readers of this entry and must not be modified.
+
+        Returns:
+            LinkState: the link state
+        """
+        if self._link_state is None:
+            self._link_state = LinkState.from_ros(self._ros_link_state)
+        return self._link_state
+
+
+def _to_row(ros_link_state: ROSLinkState) -> Tuple[float, ...]:
+    """
+    Returns the pose and twist of given ROS LinkState flattened into a row.
+
+    Args:
+        ros_link_state (ROSLinkState): ROS LinkState
+
+    Returns:
+        Tuple[float, ...]: (position.xyz, orientation.xyzw, linear.xyz, angular.xyz)
+    """
+    position = ros_link_state.pose.position
+    orientation = ros_link_state.pose.orientation
+    linear = ros_link_state.twist.linear
+    angular = ros_link_state.twist.angular
+    return (position.x, position.y, position.z,
+            orientation.x, orientation.y, orientation.z, orientation.w,
+            linear.x, linear.y, linear.z,
+            angular.x, angular.y, angular.z)
+
+
 class GetLinkStateTracker(TrackerInterface):
     """
     GetLinkState Tracker class
@@ -68,11 +168,26 @@ class GetLinkStateTracker(TrackerInterface):
                 raise RuntimeError("Attempting to construct multiple GetLinkState Tracker")
             GetLinkStateTracker._instance = self
 
-        self._lock = threading.RLock()
+        # _link_map is an immutable snapshot that is only ever replaced by rebinding the attribute,
+        # so readers can use it without locking. _lock serializes the writers.
+        self._lock = threading.Lock()
         self._link_map = {}
+        # Names of the links set_link_state added to the current link map, in the order they were last set.
+        self._added_link_names = {}
+
+        self._batch_lock = threading.Lock()
+        # The batch whose GetLinkStates service call is in flight,
+        # and the batch collecting the queries arriving meanwhile.
+        self._in_flight_batch = None
+        self._pending_batch = None
+        self._executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS)
 
-        self._get_link_states = ServiceProxyWrapper(GazeboServiceName.GET_LINK_STATES, GetLinkStates)
-        self._get_all_link_states = ServiceProxyWrapper(GazeboServiceName.GET_ALL_LINK_STATES, GetAllLinkStates)
+        self._get_link_states = ServiceProxyWrapper(GazeboServiceName.GET_LINK_STATES, GetLinkStates,
+                                                    persistent=True, tcp_nodelay=True)
+        self._get_all_link_states = ServiceProxyWrapper(GazeboServiceName.GET_ALL_LINK_STATES, GetAllLinkStates,
+                                                        persistent=True, tcp_nodelay=True)
+        # GetAllLinkStatesRequest has no fields, so a single request is reused for every update.
+        self._get_all_link_states_request = GetAllLinkStatesRequest()
         TrackerManager.get_instance().add(tracker=self, priority=consts.TrackerPriority.HIGH)
 
     def on_update_tracker(self, delta_time: float, sim_time: Clock) -> None:
@@ -83,13 +198,18 @@ class GetLinkStateTracker(TrackerInterface):
             delta_time (float): delta time
             sim_time (Clock): simulation time
         """
-        link_map = {}
-        res = self._get_all_link_states(GetAllLinkStatesRequest())
+        res = self._get_all_link_states(self._get_all_link_states_request)
         if res.success:
+            # Link names are interned, so the keys are shared across snapshots and their hashes stay cached.
+            # The interned name is also set back to the message, so the converted link state shares it.
+            link_map = {}
             for link_state in res.link_states:
-                link_map[link_state.link_name] = LinkState.from_ros(link_state)
+                link_name = sys.intern(link_state.link_name)
+                link_state.link_name = link_name
+                link_map[link_name] = _LazyLinkState(link_state)
             with self._lock:
                 self._link_map = link_map
+                self._added_link_names = {}
 
     def get_link_state(self, name: str, reference_frame: Optional[str] = None,
                        blocking: bool = False) -> LinkState:
@@ -104,24 +224,100 @@ class GetLinkStateTracker(TrackerInterface):
         Returns:
             LinkState: link state
         """
-        with self._lock:
-            if blocking or name not in self._link_map or reference_frame:
-                # if name doesn't exist in the map or if there is reference frame specified
-                # then manually retrieve link_state
-                reference_frame = reference_frame if reference_frame else ''
-                res = self._get_link_states([name], [reference_frame])
-                if res.success and res.status[0]:
-                    link_state = res.link_states[0]
-                    return LinkState(link_state.link_name,
-                                     pose=Pose.from_ros(link_state.pose),
-                                     twist=Twist.from_ros(link_state.twist),
-                                     reference_frame=link_state.reference_frame)
-                else:
-                    err_message = res.messages[0] if res.messages else ''
-                    raise DeepSimException("get_link_state failed: {} ({})".format(res.status_message,
-                                                                                   err_message))
+        if not blocking and not reference_frame:
+            cached = self._link_map.get(name)
+            if cached is not None:
+                return cached.link_state.copy()
+        # if name doesn't exist in the map or if there is reference frame specified
+        # then manually retrieve link_state
+        reference_frame = reference_frame if reference_frame else ''
+        res, idx = self._query_link_state(name, reference_frame)
+        if res.success and res.status[idx]:
+            return LinkState.from_ros(res.link_states[idx])
+        else:
+            err_message = res.messages[idx] if len(res.messages) > idx else ''
+            raise DeepSimException("get_link_state failed: {} ({})".format(res.status_message,
+                                                                           err_message))
+
+    def get_link_state_async(self, name: str, reference_frame: Optional[str] = None) -> Future:
+        """
+        Retrieve link state of given name of the link from gazebo without blocking the caller.
+        - Concurrent retrievals are coalesced into a single service call as blocking get_link_state.
+
+        Args:
+            name (str): name of the link.
+            reference_frame (Optional[str]): the reference frame
+
+        Returns:
+            Future: future resolving to the retrieved LinkState or raising DeepSimException on failure.
+        """
+        return self._executor.submit(self.get_link_state, name, reference_frame, True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the threads serving get_link_state_async.
+        - The threads are also joined on interpreter exit, so a retrieval hung in the service call
+          blocks the exit until it returns. get_link_state_async raises RuntimeError after shutdown.
+
+        Args:
+            wait (bool): flag to wait for the pending retrievals to finish or not
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _query_link_state(self, name: str, reference_frame: str) -> Tuple[GetLinkStatesResponse, int]:
+        """
+        Retrieve link state of given name of the link from gazebo.
+        - If no GetLinkStates service call is in flight, the query is sent right away.
+          Queries arriving while a call is in flight are coalesced into the next batch,
+          which is sent by its first caller as soon as the in flight call returns.
+
+        Args:
+            name (str): name of the link.
+            reference_frame (str): the reference frame
+
+        Returns:
+            Tuple[GetLinkStatesResponse, int]: the service response and the index of the query in the response.
+        """
+        with self._batch_lock:
+            is_sender = False
+            if self._in_flight_batch is None:
+                batch = _PendingBatch()
+                batch.send_event.set()
+                self._in_flight_batch = batch
+                is_sender = True
+            elif self._pending_batch is None:
+                batch = _PendingBatch()
+                self._pending_batch = batch
+                is_sender = True
             else:
-                return self._link_map[name].copy()
+                batch = self._pending_batch
+            idx = len(batch.names)
+            batch.names.append(name)
+            batch.reference_frames.append(reference_frame)
+
+        if is_sender:
+            batch.send_event.wait()
+            try:
+                batch.res = self._get_link_states(batch.names, batch.reference_frames)
+            except Exception as ex:
+                batch.error = ex
+            finally:
+                with self._batch_lock:
+                    # Hand over to the next batch, no more queries can join it once it's in flight.
+                    next_batch = self._pending_batch
+                    self._pending_batch = None
+                    self._in_flight_batch = next_batch
+                if next_batch is not None:
+                    next_batch.send_event.set()
+                batch.done_event.set()
+        else:
+            batch.done_event.wait()
+
+        if batch.error is not None:
+            # The error is shared by all callers of the batch, so each raises its own exception
+            # not to mix their tracebacks into the shared one.
+            raise DeepSimException("get_link_state failed: {}".format(batch.error)) from batch.error
+        return batch.res, idx
 
     def get_link_states(self, names: Collection[str], reference_frames: Optional[Collection[str]] = None,
                         blocking: bool = False) -> Dict[Tuple[str, str], LinkState]:
@@ -137,25 +333,38 @@ class GetLinkStateTracker(TrackerInterface):
         Returns:
             Dict[Tuple[str, str], LinkState]: {(name, reference_frame): link_state}
         """
-
-        links = OrderedDict()
         if reference_frames is None:
             reference_frames = ['' for _ in names]
         if len(names) != len(reference_frames):
             err_msg = "names ({}) and reference_frames ({}) must be equal size!".format(len(names),
                                                                                         len(reference_frames))
             raise ValueError(err_msg)
+
+        # Look up each name in the map only once, the entries are shared by both paths below.
+        if blocking:
+            cached_entries = [None] * len(names)
+        else:
+            link_map = self._link_map
+            cached_entries = [None if reference_frame else link_map.get(name)
+                              for name, reference_frame in zip(names, reference_frames)]
+            if None not in cached_entries:
+                # If every link is in the map, then serve all of them from the map
+                # without building the query for the service.
+                return {(name, reference_frame): cached.link_state.copy()
+                        for name, reference_frame, cached in zip(names, reference_frames, cached_entries)}
+
+        links = {}
         query_names = []
         query_reference_frames = []
-        with self._lock:
-            for name, reference_frame in zip(names, reference_frames):
-                key = (name, reference_frame)
-                if blocking or name not in self._link_map or reference_frame:
-                    query_names.append(name)
-                    query_reference_frames.append(reference_frame)
-                    links[key] = LinkState()
-                else:
-                    links[key] = self._link_map[name].copy()
+        for name, reference_frame, cached in zip(names, reference_frames, cached_entries):
+            key = (name, reference_frame)
+            if cached is None:
+                query_names.append(name)
+                query_reference_frames.append(reference_frame)
+                # Reserve the position of the key to keep the order of names, it's filled after the query.
+                links[key] = None
+            else:
+                links[key] = cached.link_state.copy()
 
         if len(query_names) > 0 and len(query_reference_frames) > 0:
             res = self._get_link_states(query_names, query_reference_frames)
@@ -163,10 +372,7 @@ class GetLinkStateTracker(TrackerInterface):
                 for idx, link_state in enumerate(res.link_states):
                     key = (query_names[idx], query_reference_frames[idx])
                     if res.status[idx]:
-                        links[key] = LinkState(link_state.link_name,
-                                               pose=Pose.from_ros(link_state.pose),
-                                               twist=Twist.from_ros(link_state.twist),
-                                               reference_frame=link_state.reference_frame)
+                        links[key] = LinkState.from_ros(link_state)
                     else:
                         links[key] = None
             else:
@@ -176,9 +382,96 @@ class GetLinkStateTracker(TrackerInterface):
     def set_link_state(self, link_state: LinkState) -> None:
         """
         Set given LinkState to cache.
+        - If set_link_state adds more than MAX_LINK_MAP_SIZE links that are not in the tracked links,
+          the least recently set of those links are evicted. The tracked links are never evicted.
 
         Args:
             link_state (LinkState): link state to cache.
         """
+        link_name = link_state.link_name
+        if isinstance(link_name, str):
+            link_name = sys.intern(link_name)
+        cached = _LazyLinkState(link_state=link_state.copy())
         with self._lock:
-            self._link_map[link_state.link_name] = link_state.copy()
+            link_map = dict(self._link_map)
+            added_link_names = self._added_link_names
+            if link_name in added_link_names:
+                # Re-insert to move the link to the most recently set position.
+                del added_link_names[link_name]
+                added_link_names[link_name] = None
+            elif link_name not in link_map:
+                added_link_names[link_name] = None
+            link_map[link_name] = cached
+            if len(added_link_names) > MAX_LINK_MAP_SIZE:
+                for evict_name in list(islice(added_link_names, len(added_link_names) - MAX_LINK_MAP_SIZE)):
+                    del added_link_names[evict_name]
+                    del link_map[evict_name]
+            self._link_map = link_map
+
+    def get_positions(self, names: Collection[str]) -> np.ndarray:
+        """
+        Return positions of given names of the links.
+
+        Args:
+            names (Collection[str]): name of the links.
+
+        Returns:
+            np.ndarray: (len(names), 3) array of position x, y, z in world frame
+        """
+        return self._get_link_rows(names)[:, _POSITION_COLUMNS]
+
+    def get_orientations(self, names: Collection[str]) -> np.ndarray:
+        """
+        Return orientations of given names of the links.
+
+        Args:
+            names (Collection[str]): name of the links.
+
+        Returns:
+            np.ndarray: (len(names), 4) array of orientation quaternion x, y, z, w in world frame
+        """
+        return self._get_link_rows(names)[:, _ORIENTATION_COLUMNS]
+
+    def get_twists(self, names: Collection[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return twists of given names of the links.
+
+        Args:
+            names (Collection[str]): name of the links.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (len(names), 3) arrays of linear and angular velocity x, y, z
+                                           in world frame
+        """
+        rows = self._get_link_rows(names)
+        return rows[:, _LINEAR_COLUMNS], rows[:, _ANGULAR_COLUMNS]
+
+    def _get_link_rows(self, names: Collection[str]) -> np.ndarray:
+        """
+        Return link state rows of given names of the links.
+        - The link map keeps an entry per link rather than column arrays, so the rows of given names
+          are built on each call.
+        - Links missing in the map, or set by set_link_state in other than world frame,
+          are retrieved in world frame through get_link_states.
+
+        Args:
+            names (Collection[str]): name of the links.
+
+        Returns:
+            np.ndarray: (len(names), _ROW_SIZE) array of link state rows
+        """
+        link_map = self._link_map
+        cached_entries = [link_map.get(name) for name in names]
+        cached_entries = [cached if cached is not None
+                          and cached.ros_link_state.reference_frame in _WORLD_REFERENCE_FRAMES else None
+                          for cached in cached_entries]
+        missing_rows = {}
+        if None in cached_entries:
+            missing_names = [name for name, cached in zip(names, cached_entries) if cached is None]
+            link_states = self.get_link_states(missing_names, blocking=True)
+            for (name, _), link_state in link_states.items():
+                if link_state is None:
+                    raise DeepSimException("get_link_state failed: {}".format(name))
+                missing_rows[name] = _to_row(link_state.to_ros())
+        return np.array([_to_row(cached.ros_link_state) if cached is not None else missing_rows[name]
+                         for name, cached in zip(names, cached_entries)], dtype=float).reshape(-1, _ROW_SIZE)
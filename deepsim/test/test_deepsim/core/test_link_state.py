@@ -144,6 +144,28 @@ class LinkStateTest(TestCase):
         assert link_state_copy.twist is not link_state.twist
         assert link_state_copy.reference_frame == link_state.reference_frame
 
+    def test_copy_modify(self):
+        link_name = myself()
+        pose = Pose(position=Point(0.1, 0.2, 0.3),
+                    orientation=Quaternion(0.2, 0.3, 0.4, 0.5))
+        twist = Twist(linear=Vector3(0.3, 0.4, 0.5),
+                      angular=Vector3(0.4, 0.5, 0.6))
+
+        link_state = LinkState(link_name=link_name,
+                               pose=pose,
+                               twist=twist)
+
+        link_state_copy = link_state.copy()
+        link_state_copy.link_name = myself() + "_copy"
+        link_state_copy.pose = Pose(position=Point(1.0, 2.0, 3.0))
+        link_state_copy.twist = Twist(linear=Vector3(1.0, 2.0, 3.0))
+        link_state_copy.reference_frame = myself() + "_reference"
+
+        assert link_state.link_name == link_name
+        assert link_state.pose == pose
+        assert link_state.twist == twist
+        assert link_state.reference_frame == ''
+
     def test_eq(self):
         link_name = myself()
         reference_frame = myself() + "_reference"
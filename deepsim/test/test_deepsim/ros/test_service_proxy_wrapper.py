@@ -17,6 +17,7 @@ from typing import Any, Callable
 from unittest import TestCase
 from unittest.mock import patch, MagicMock, call
 import inspect
+import socket
 
 from deepsim.ros.service_proxy_wrapper import ServiceProxyWrapper
 
@@ -105,3 +106,87 @@ class ServiceProxyWrapperTest(TestCase):
         with self.assertRaises(TypeError):
             service_wrapper(arg)
             assert rospy_mock.ServiceProxy.return_value.call_count == 1
+
+    def test_initialize_tcp_nodelay(self, rospy_mock):
+        _ = ServiceProxyWrapper(name=self.name,
+                                service_class=self.service_class_mock,
+                                headers={'key': 'value'},
+                                tcp_nodelay=True)
+
+        rospy_mock.ServiceProxy.assert_called_once_with(name=self.name,
+                                                        service_class=self.service_class_mock,
+                                                        persistent=False,
+                                                        headers={'key': 'value', 'tcp_nodelay': '1'})
+
+    def test_call_tcp_nodelay_persistent(self, rospy_mock):
+        service_wrapper = ServiceProxyWrapper(name=self.name,
+                                              service_class=self.service_class_mock,
+                                              persistent=True,
+                                              tcp_nodelay=True)
+        transport_mock = rospy_mock.ServiceProxy.return_value.transport
+        arg = MagicMock()
+        service_wrapper(arg)
+        service_wrapper(arg)
+        transport_mock.socket.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def test_call_tcp_nodelay_reconnected(self, rospy_mock):
+        client_mock = rospy_mock.ServiceProxy.return_value
+        transport_mocks = [MagicMock(), MagicMock()]
+
+        def call_mock(*args, **kwargs):
+            # Connect on the call if there is no connection, and fail the call once the first connection is set.
+            if client_mock.transport is None:
+                client_mock.transport = transport_mocks.pop(0)
+            elif transport_mocks:
+                raise Exception()
+            return MagicMock()
+        client_mock.side_effect = call_mock
+        client_mock.transport = None
+
+        service_wrapper = ServiceProxyWrapper(name=self.name,
+                                              service_class=self.service_class_mock,
+                                              persistent=True,
+                                              tcp_nodelay=True)
+        first_transport_mock, second_transport_mock = transport_mocks
+        service_wrapper(MagicMock())
+        service_wrapper(MagicMock())
+        first_transport_mock.socket.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        second_transport_mock.socket.setsockopt.assert_called_once_with(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        assert client_mock.transport is second_transport_mock
+
+    def test_call_tcp_nodelay_failed(self, rospy_mock):
+        client_mock = rospy_mock.ServiceProxy.return_value
+        transport_mock = client_mock.transport
+        transport_mock.socket.setsockopt.side_effect = OSError()
+
+        service_wrapper = ServiceProxyWrapper(name=self.name,
+                                              service_class=self.service_class_mock,
+                                              persistent=True,
+                                              tcp_nodelay=True)
+        arg = MagicMock()
+        assert service_wrapper(arg) == client_mock.return_value
+        service_wrapper(arg)
+        # The succeeded call is not retried, the connection is kept and TCP_NODELAY is not set again on it.
+        assert client_mock.call_count == 2
+        client_mock.close.assert_not_called()
+        transport_mock.socket.setsockopt.assert_called_once()
+        rospy_mock.logerr.assert_called_once()
+
+    def test_call_tcp_nodelay_non_persistent(self, rospy_mock):
+        service_wrapper = ServiceProxyWrapper(name=self.name,
+                                              service_class=self.service_class_mock,
+                                              tcp_nodelay=True)
+        transport_mock = rospy_mock.ServiceProxy.return_value.transport
+        service_wrapper(MagicMock())
+        transport_mock.socket.setsockopt.assert_not_called()
+
+    def test_call_exception_persistent(self, rospy_mock):
+        client_mock = rospy_mock.ServiceProxy.return_value
+        client_mock.side_effect = [Exception(), MagicMock()]
+
+        service_wrapper = ServiceProxyWrapper(name=self.name,
+                                              service_class=self.service_class_mock,
+                                              persistent=True)
+        service_wrapper(MagicMock())
+        client_mock.close.assert_called_once()
+        assert client_mock.transport is None
@@ -17,7 +17,13 @@ from typing import Any, Callable
 from unittest import TestCase
 from unittest.mock import patch, MagicMock, call
 import inspect
+import sys
+import threading
+import time
 
+import numpy as np
+
+from deepsim.sim_trackers.trackers import get_link_state_tracker
 from deepsim.sim_trackers.trackers.get_link_state_tracker import GetLinkStateTracker
 from deepsim.gazebo.constants import GazeboServiceName
 from deepsim.core.pose import Pose
@@ -35,13 +41,22 @@ from deepsim_msgs.srv import (
 myself: Callable[[], Any] = lambda: inspect.stack()[1][3]
 
 
+def wait_until(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
 @patch("deepsim.sim_trackers.trackers.get_link_state_tracker.ServiceProxyWrapper")
 class GetLinkStateTrackerTest(TestCase):
     def setUp(self) -> None:
         get_link_states_mock = MagicMock()
         get_all_link_states_mock = MagicMock()
 
-        def get_service_mock(service_name, service_type):
+        def get_service_mock(service_name, service_type, **kwargs):
             if service_name == GazeboServiceName.GET_LINK_STATES:
                 return get_link_states_mock
             elif service_name == GazeboServiceName.GET_ALL_LINK_STATES:
@@ -55,8 +70,8 @@ class GetLinkStateTrackerTest(TestCase):
     def test_initialize(self, service_proxy_wrapper_mock):
         _ = GetLinkStateTracker(is_singleton=False)
         service_proxy_wrapper_mock.assert_has_calls([
-            call(GazeboServiceName.GET_LINK_STATES, GetLinkStates),
-            call(GazeboServiceName.GET_ALL_LINK_STATES, GetAllLinkStates),
+            call(GazeboServiceName.GET_LINK_STATES, GetLinkStates, persistent=True, tcp_nodelay=True),
+            call(GazeboServiceName.GET_ALL_LINK_STATES, GetAllLinkStates, persistent=True, tcp_nodelay=True),
         ])
 
     def test_on_update_tracker(self, service_proxy_wrapper_mock):
@@ -91,8 +106,52 @@ class GetLinkStateTrackerTest(TestCase):
 
         assert link_name1 in tracker._link_map
         assert link_name2 in tracker._link_map
-        assert expected_link_state1 == tracker._link_map[link_name1]
-        assert expected_link_state2 == tracker._link_map[link_name2]
+        assert expected_link_state1 == tracker._link_map[link_name1].link_state
+        assert expected_link_state2 == tracker._link_map[link_name2].link_state
+
+    def test_on_update_tracker_interns_link_names(self, service_proxy_wrapper_mock):
+        link_name = "".join([myself(), "_link"])
+        link_state = LinkState(link_name=link_name)
+        res = GetAllLinkStatesResponse()
+        res.success = True
+        res.status_message = ''
+        res.link_states = [link_state.to_ros()]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_all_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.on_update_tracker(0.1, None)
+
+        key = next(iter(tracker._link_map))
+        assert key == link_name
+        assert key is sys.intern(link_name)
+        assert tracker._link_map[key].link_state.link_name is key
+
+    @patch("deepsim.sim_trackers.trackers.get_link_state_tracker.LinkState.from_ros", wraps=LinkState.from_ros)
+    def test_on_update_tracker_converts_on_first_read(self, from_ros_mock, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        expected_link_state1 = LinkState(link_name=link_name1,
+                                         pose=Pose(position=Vector3(1.0, 2.0, 3.0)))
+        expected_link_state2 = LinkState(link_name=link_name2,
+                                         pose=Pose(position=Vector3(4.0, 5.0, 6.0)))
+        res = GetAllLinkStatesResponse()
+        res.success = True
+        res.status_message = ''
+        res.link_states = [expected_link_state1.to_ros(),
+                           expected_link_state2.to_ros()]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_all_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.on_update_tracker(0.1, None)
+        from_ros_mock.assert_not_called()
+
+        assert tracker.get_link_state(link_name1) == expected_link_state1
+        assert tracker.get_link_state(link_name1) == expected_link_state1
+        from_ros_mock.assert_called_once()
 
     def test_get_link_state(self, service_proxy_wrapper_mock):
         link_name1 = myself() + "1"
@@ -132,10 +191,10 @@ class GetLinkStateTrackerTest(TestCase):
         assert link_state2 == expected_link_state2
 
         # Check returned link state is a copy
-        assert tracker._link_map[link_name1] == link_state1
-        assert tracker._link_map[link_name1] is not link_state1
-        assert tracker._link_map[link_name2] == link_state2
-        assert tracker._link_map[link_name2] is not link_state2
+        assert tracker._link_map[link_name1].link_state == link_state1
+        assert tracker._link_map[link_name1].link_state is not link_state1
+        assert tracker._link_map[link_name2].link_state == link_state2
+        assert tracker._link_map[link_name2].link_state is not link_state2
         self.get_link_states_mock.assert_not_called()
 
     def test_get_link_state_blocking(self, service_proxy_wrapper_mock):
@@ -161,6 +220,48 @@ class GetLinkStateTrackerTest(TestCase):
         self.get_link_states_mock.assert_called_once_with([link_name], [''])
         assert link_state == expected_link_state
 
+    def test_get_link_state_blocking_does_not_block_update(self, service_proxy_wrapper_mock):
+        link_name = myself()
+        cached_link_name = myself() + "_cached"
+        expected_link_state = LinkState(link_name=link_name)
+
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [expected_link_state.to_ros()]
+        all_res = GetAllLinkStatesResponse()
+        all_res.success = True
+        all_res.status_message = ''
+        all_res.link_states = [LinkState(link_name=cached_link_name).to_ros()]
+
+        query_started = threading.Event()
+        query_released = threading.Event()
+
+        def get_link_states(names, reference_frames):
+            query_started.set()
+            query_released.wait(5.0)
+            return res
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.side_effect = get_link_states
+        self.get_all_link_states_mock.return_value = all_res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(tracker.get_link_state(link_name,
+                                                                                       blocking=True)))
+        thread.start()
+        assert query_started.wait(5.0)
+
+        # Update and cache reads are not blocked by the in-flight query.
+        tracker.on_update_tracker(0.1, None)
+        tracker.set_link_state(LinkState(link_name=myself() + "_set"))
+        assert tracker.get_link_state(cached_link_name) == LinkState(link_name=cached_link_name)
+
+        query_released.set()
+        thread.join()
+        assert results == [expected_link_state]
+
     def test_get_link_state_missing_in_dict(self, service_proxy_wrapper_mock):
         link_name = myself()
         pose = Pose(position=Vector3(1.0, 2.0, 3.0),
@@ -257,13 +358,185 @@ class GetLinkStateTrackerTest(TestCase):
 
         assert link_state == expected_link_state
         # Check returned link state is a copy
-        assert tracker._link_map[link_name] == link_state
-        assert tracker._link_map[link_name] is not link_state
+        assert tracker._link_map[link_name].link_state == link_state
+        assert tracker._link_map[link_name].link_state is not link_state
 
         link_state_w_ref = tracker.get_link_state(link_name, reference_frame=reference_frame)
         assert link_state_w_ref == expected_link_state_w_ref
         self.get_link_states_mock.assert_called_once_with([link_name], [reference_frame])
 
+    def test_get_link_state_uncontended_query_not_delayed(self, service_proxy_wrapper_mock):
+        link_name = myself()
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [LinkState(link_name=link_name).to_ros()]
+
+        in_flight_batches = []
+
+        def get_link_states(names, reference_frames):
+            in_flight_batches.append((list(tracker._in_flight_batch.names), tracker._pending_batch))
+            return res
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.side_effect = get_link_states
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        num_queries = 10
+        for _ in range(num_queries):
+            tracker.get_link_state(link_name, blocking=True)
+
+        # With no service call in flight each query is sent right away without waiting for others to join.
+        assert self.get_link_states_mock.call_count == num_queries
+        assert in_flight_batches == [([link_name], None)] * num_queries
+        assert tracker._in_flight_batch is None
+        assert tracker._pending_batch is None
+
+    def test_get_link_state_concurrent_queries_batched(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_name3 = myself() + "3"
+        expected_link_states = {link_name: LinkState(link_name=link_name,
+                                                     pose=Pose(position=Vector3(idx, idx, idx)))
+                                for idx, link_name in enumerate([link_name1, link_name2, link_name3])}
+
+        in_flight_event = threading.Event()
+        release_event = threading.Event()
+
+        def get_link_states(names, reference_frames):
+            if not in_flight_event.is_set():
+                in_flight_event.set()
+                release_event.wait(5.0)
+            res = GetLinkStatesResponse()
+            res.status = [True for _ in names]
+            res.success = True
+            res.link_states = [expected_link_states[name].to_ros() for name in names]
+            return res
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.side_effect = get_link_states
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        results = {}
+
+        def query(link_name):
+            results[link_name] = tracker.get_link_state(link_name, blocking=True)
+
+        threads = [threading.Thread(target=query, args=(link_name,))
+                   for link_name in [link_name1, link_name2, link_name3]]
+        threads[0].start()
+        # The first query is sent right away and blocks in the service call.
+        assert in_flight_event.wait(5.0)
+        # Queries arriving while the first call is in flight join the next batch.
+        for num_joined, thread in enumerate(threads[1:], 1):
+            thread.start()
+            assert wait_until(lambda: (tracker._pending_batch is not None
+                                       and len(tracker._pending_batch.names) == num_joined))
+        release_event.set()
+        for thread in threads:
+            thread.join()
+
+        assert self.get_link_states_mock.call_args_list == [
+            call([link_name1], ['']),
+            call([link_name2, link_name3], ['', ''])
+        ]
+        assert results == expected_link_states
+        assert tracker._in_flight_batch is None
+        assert tracker._pending_batch is None
+
+    def test_get_link_state_concurrent_queries_failed(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_name3 = myself() + "3"
+
+        in_flight_event = threading.Event()
+        release_event = threading.Event()
+
+        def get_link_states(names, reference_frames):
+            if not in_flight_event.is_set():
+                in_flight_event.set()
+                release_event.wait(5.0)
+            raise RuntimeError("Failed")
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.side_effect = get_link_states
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        errors = {}
+
+        def query(link_name):
+            try:
+                tracker.get_link_state(link_name, blocking=True)
+            except DeepSimException as ex:
+                errors[link_name] = ex
+
+        threads = [threading.Thread(target=query, args=(link_name,))
+                   for link_name in [link_name1, link_name2, link_name3]]
+        threads[0].start()
+        assert in_flight_event.wait(5.0)
+        for num_joined, thread in enumerate(threads[1:], 1):
+            thread.start()
+            assert wait_until(lambda: (tracker._pending_batch is not None
+                                       and len(tracker._pending_batch.names) == num_joined))
+        release_event.set()
+        for thread in threads:
+            thread.join()
+
+        # A failed service call still hands over to the next batch.
+        assert self.get_link_states_mock.call_count == 2
+        assert set(errors) == {link_name1, link_name2, link_name3}
+        # Callers of the same batch raise their own exceptions chained from the shared service call error.
+        assert errors[link_name2] is not errors[link_name3]
+        assert isinstance(errors[link_name2].__cause__, RuntimeError)
+        assert errors[link_name2].__cause__ is errors[link_name3].__cause__
+        assert errors[link_name1].__cause__ is not errors[link_name2].__cause__
+        assert tracker._in_flight_batch is None
+
+    def test_get_link_state_async(self, service_proxy_wrapper_mock):
+        link_name = myself()
+        expected_link_state = LinkState(link_name=link_name,
+                                        pose=Pose(position=Vector3(1.0, 2.0, 3.0)))
+
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [expected_link_state.to_ros()]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        # Cached link state must not be used as async retrieval always queries gazebo.
+        tracker.set_link_state(LinkState(link_name=link_name))
+        future = tracker.get_link_state_async(link_name)
+        assert future.result(timeout=5.0) == expected_link_state
+        self.get_link_states_mock.assert_called_once_with([link_name], [''])
+
+        res.success = False
+        res.messages = ["Failed"]
+        future = tracker.get_link_state_async(link_name)
+        with self.assertRaises(DeepSimException):
+            future.result(timeout=5.0)
+
+    def test_shutdown(self, service_proxy_wrapper_mock):
+        link_name = myself()
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [LinkState(link_name=link_name).to_ros()]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        future = tracker.get_link_state_async(link_name)
+        tracker.shutdown()
+        # Pending retrievals are finished before shutdown returns.
+        assert future.done()
+        assert future.result() == LinkState(link_name=link_name)
+        with self.assertRaises(RuntimeError):
+            tracker.get_link_state_async(link_name)
+
     def test_get_link_states(self, service_proxy_wrapper_mock):
         link_name1 = myself() + "1"
         link_name2 = myself() + "2"
@@ -357,6 +630,30 @@ class GetLinkStateTrackerTest(TestCase):
         self.get_link_states_mock.assert_called_once_with([link_name], [''])
         assert link_state == expected_return
 
+    def test_get_link_states_partially_missing_in_dict(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_state1 = LinkState(link_name=link_name1,
+                                pose=Pose(position=Vector3(1.0, 2.0, 3.0)))
+        link_state2 = LinkState(link_name=link_name2,
+                                pose=Pose(position=Vector3(4.0, 5.0, 6.0)))
+
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [link_state2.to_ros()]
+        self.get_link_states_mock.return_value = res
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.set_link_state(link_state1)
+        link_states = tracker.get_link_states([link_name1, link_name2])
+
+        self.get_link_states_mock.assert_called_once_with([link_name2], [''])
+        assert list(link_states.keys()) == [(link_name1, ''), (link_name2, '')]
+        assert link_states[(link_name1, '')] == link_state1
+        assert link_states[(link_name2, '')] == link_state2
+
     def test_get_link_states_missing_and_failed_to_retrieve(self, service_proxy_wrapper_mock):
         link_name = myself()
 
@@ -431,8 +728,8 @@ class GetLinkStateTrackerTest(TestCase):
 
         assert link_state == expected_link_state
         # Check returned link state is a copy
-        assert tracker._link_map[link_name] == link_state
-        assert tracker._link_map[link_name] is not link_state
+        assert tracker._link_map[link_name].link_state == link_state
+        assert tracker._link_map[link_name].link_state is not link_state
 
         link_state_w_ref = tracker.get_link_states([link_name], reference_frames=[reference_frame])
         assert link_state_w_ref == expected_return
@@ -451,3 +748,191 @@ class GetLinkStateTrackerTest(TestCase):
         expected_link_state = LinkState(link_name=link_name)
         tracker.set_link_state(expected_link_state)
         assert expected_link_state == tracker.get_link_state(name=link_name)
+
+    def test_set_link_state_without_link_name(self, service_proxy_wrapper_mock):
+        tracker = GetLinkStateTracker(is_singleton=False)
+        expected_link_state = LinkState()
+        tracker.set_link_state(expected_link_state)
+        assert expected_link_state == tracker._link_map[None].link_state
+
+    @patch("deepsim.sim_trackers.trackers.get_link_state_tracker.MAX_LINK_MAP_SIZE", 2)
+    def test_set_link_state_evicts_least_recently_set(self, service_proxy_wrapper_mock):
+        tracker = GetLinkStateTracker(is_singleton=False)
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_name3 = myself() + "3"
+        tracker.set_link_state(LinkState(link_name=link_name1))
+        tracker.set_link_state(LinkState(link_name=link_name2))
+        # Setting link_name1 again makes link_name2 the least recently set.
+        tracker.set_link_state(LinkState(link_name=link_name1))
+        tracker.set_link_state(LinkState(link_name=link_name3))
+
+        assert list(tracker._link_map.keys()) == [link_name1, link_name3]
+
+    @patch("deepsim.sim_trackers.trackers.get_link_state_tracker.MAX_LINK_MAP_SIZE", 1)
+    def test_set_link_state_does_not_evict_tracked_links(self, service_proxy_wrapper_mock):
+        tracked_link_names = [myself() + "_tracked" + str(idx) for idx in range(3)]
+        res = GetAllLinkStatesResponse()
+        res.success = True
+        res.status_message = ''
+        res.link_states = [LinkState(link_name=link_name).to_ros() for link_name in tracked_link_names]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_all_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.on_update_tracker(0.1, None)
+
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        # Setting a tracked link doesn't count towards MAX_LINK_MAP_SIZE.
+        tracker.set_link_state(LinkState(link_name=tracked_link_names[0],
+                                         pose=Pose(position=Vector3(1.0, 2.0, 3.0))))
+        tracker.set_link_state(LinkState(link_name=link_name1))
+        tracker.set_link_state(LinkState(link_name=link_name2))
+
+        assert list(tracker._link_map.keys()) == tracked_link_names + [link_name2]
+        assert tracker._link_map[tracked_link_names[0]].link_state.pose == Pose(position=Vector3(1.0, 2.0, 3.0))
+
+        # New snapshot replaces the links added by set_link_state.
+        tracker.on_update_tracker(0.1, None)
+        tracker.set_link_state(LinkState(link_name=link_name1))
+        assert list(tracker._link_map.keys()) == tracked_link_names + [link_name1]
+
+    def test_set_link_state_publishes_new_snapshot(self, service_proxy_wrapper_mock):
+        tracker = GetLinkStateTracker(is_singleton=False)
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        tracker.set_link_state(LinkState(link_name=link_name1))
+        snapshot = tracker._link_map
+
+        tracker.set_link_state(LinkState(link_name=link_name2))
+
+        assert tracker._link_map is not snapshot
+        assert link_name2 not in snapshot
+        assert link_name1 in tracker._link_map
+        assert link_name2 in tracker._link_map
+
+    def test_get_positions_orientations_twists(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_state1 = LinkState(link_name=link_name1,
+                                pose=Pose(position=Vector3(1.0, 2.0, 3.0),
+                                          orientation=Quaternion(2.0, 3.0, 4.0, 5.0)),
+                                twist=Twist(linear=Vector3(2.0, 3.0, 4.0),
+                                            angular=Vector3(3.0, 4.0, 5.0)))
+        link_state2 = LinkState(link_name=link_name2,
+                                pose=Pose(position=Vector3(3.0, 4.0, 5.0),
+                                          orientation=Quaternion(4.0, 5.0, 6.0, 7.0)),
+                                twist=Twist(linear=Vector3(3.0, 4.0, 5.0),
+                                            angular=Vector3(4.0, 5.0, 6.0)))
+        res = GetAllLinkStatesResponse()
+        res.success = True
+        res.status_message = ''
+        res.link_states = [link_state1.to_ros(), link_state2.to_ros()]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_all_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.on_update_tracker(0.1, None)
+
+        positions = tracker.get_positions([link_name2, link_name1])
+        orientations = tracker.get_orientations([link_name2, link_name1])
+        linear, angular = tracker.get_twists([link_name2, link_name1])
+
+        assert np.array_equal(positions, [[3.0, 4.0, 5.0], [1.0, 2.0, 3.0]])
+        assert np.array_equal(orientations, [[4.0, 5.0, 6.0, 7.0], [2.0, 3.0, 4.0, 5.0]])
+        assert np.array_equal(linear, [[3.0, 4.0, 5.0], [2.0, 3.0, 4.0]])
+        assert np.array_equal(angular, [[4.0, 5.0, 6.0], [3.0, 4.0, 5.0]])
+
+        # Modifying returned array doesn't affect the cache.
+        positions[0] = [0.0, 0.0, 0.0]
+        assert np.array_equal(tracker.get_positions([link_name2]), [[3.0, 4.0, 5.0]])
+        self.get_link_states_mock.assert_not_called()
+
+    @patch("deepsim.sim_trackers.trackers.get_link_state_tracker._to_row",
+           wraps=get_link_state_tracker._to_row)
+    def test_get_positions_builds_requested_rows_only(self, to_row_mock, service_proxy_wrapper_mock):
+        link_names = [myself() + str(idx) for idx in range(10)]
+        res = GetAllLinkStatesResponse()
+        res.success = True
+        res.status_message = ''
+        res.link_states = [LinkState(link_name=link_name,
+                                     pose=Pose(position=Vector3(idx, idx, idx))).to_ros()
+                           for idx, link_name in enumerate(link_names)]
+
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+        self.get_all_link_states_mock.return_value = res
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.on_update_tracker(0.1, None)
+
+        assert np.array_equal(tracker.get_positions([link_names[3]]), [[3.0, 3.0, 3.0]])
+        assert to_row_mock.call_count == 1
+
+        tracker.set_link_state(LinkState(link_name=link_names[5]))
+        assert np.array_equal(tracker.get_positions([link_names[5]]), [[0.0, 0.0, 0.0]])
+        assert to_row_mock.call_count == 2
+
+    def test_get_positions_after_set_link_state(self, service_proxy_wrapper_mock):
+        tracker = GetLinkStateTracker(is_singleton=False)
+        link_name = myself()
+        tracker.set_link_state(LinkState(link_name=link_name,
+                                         pose=Pose(position=Vector3(1.0, 2.0, 3.0))))
+        assert np.array_equal(tracker.get_positions([link_name]), [[1.0, 2.0, 3.0]])
+
+        tracker.set_link_state(LinkState(link_name=link_name,
+                                         pose=Pose(position=Vector3(4.0, 5.0, 6.0))))
+        assert np.array_equal(tracker.get_positions([link_name]), [[4.0, 5.0, 6.0]])
+
+    def test_get_positions_missing_in_dict(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_state2 = LinkState(link_name=link_name2,
+                                pose=Pose(position=Vector3(4.0, 5.0, 6.0)))
+
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [link_state2.to_ros()]
+        self.get_link_states_mock.return_value = res
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.set_link_state(LinkState(link_name=link_name1,
+                                         pose=Pose(position=Vector3(1.0, 2.0, 3.0))))
+        positions = tracker.get_positions([link_name1, link_name2])
+
+        self.get_link_states_mock.assert_called_once_with([link_name2], [''])
+        assert np.array_equal(positions, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+        res.status = [False]
+        with self.assertRaises(DeepSimException):
+            tracker.get_positions([link_name2])
+
+    def test_get_positions_set_in_other_reference_frame(self, service_proxy_wrapper_mock):
+        link_name1 = myself() + "1"
+        link_name2 = myself() + "2"
+        link_state2 = LinkState(link_name=link_name2,
+                                pose=Pose(position=Vector3(4.0, 5.0, 6.0)))
+
+        res = GetLinkStatesResponse()
+        res.status = [True]
+        res.success = True
+        res.link_states = [link_state2.to_ros()]
+        self.get_link_states_mock.return_value = res
+        service_proxy_wrapper_mock.side_effect = self.get_service_mock
+
+        tracker = GetLinkStateTracker(is_singleton=False)
+        tracker.set_link_state(LinkState(link_name=link_name1,
+                                         pose=Pose(position=Vector3(1.0, 2.0, 3.0)),
+                                         reference_frame="world"))
+        tracker.set_link_state(LinkState(link_name=link_name2,
+                                         pose=Pose(position=Vector3(7.0, 8.0, 9.0)),
+                                         reference_frame=myself() + "_reference_frame"))
+        positions = tracker.get_positions([link_name1, link_name2])
+
+        # Link set in other than world frame is retrieved in world frame.
+        self.get_link_states_mock.assert_called_once_with([link_name2], [''])
+        assert np.array_equal(positions, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])